@@ -161,6 +161,7 @@ class FastSyntheticGenerator:
         self.forced_explicit_parents, self.interleave_last_var = set(), {}
         self.pk_next_vals = {}
         self.parent_child_assignments, self.fk_population_rates = {}, {}
+        self.fk_population_rates_frozen = ()
         self.used_pk_values = {}
         self.pk_counter_lock = threading.Lock()
         self.default_rows_per_table = args.rows if args.rows is not None else 100
@@ -216,6 +217,10 @@ class FastSyntheticGenerator:
             fk_pop_rates = table_cfg.get("fk_population_rate", {})
             if fk_pop_rates:
                 self.fk_population_rates[table_key] = fk_pop_rates
+        # Frozen snapshot used as the lookup_fk_threshold cache key; drop any
+        # entries cached for a previously loaded config
+        lookup_fk_threshold.cache_clear()
+        self.fk_population_rates_frozen = freeze_fk_population_rates(self.fk_population_rates)
         
         for key in config_table_names:
             schema, table = key.split(".", 1)
@@ -847,6 +852,18 @@ class FastSyntheticGenerator:
                     debug_print("{0}: Conditional FK column {1} has {2} total unique parent values from {3} tables".format(
                         node, fk_col, len(parent_caches[fk_col]), len(fk_list)))
         
+        # SoA mirror of parent_caches: contiguous arrays (NumPy permitting) for
+        # the bulk FK draws below; the list form is kept for per-row paths
+        parent_caches_np = {col: as_parent_array(vals) for col, vals in parent_caches.items()}
+
+        # Hoist the conditional pools into (tuple, length) pairs so each per-row
+        # pick is a single indexed randrange instead of rng.choice re-running
+        # len() and sequence dispatch every call
+        conditional_pick_pools = {}
+        for cname, vals in conditional_fk_caches.items():
+            if vals:
+                conditional_pick_pools[cname] = (tuple(vals), len(vals))
+
         composite_cfgs = self.find_composite_fks_for_child(node)
         composite_columns_all = set()
         for comp in composite_cfgs:
@@ -1705,7 +1722,69 @@ class FastSyntheticGenerator:
         
         # Track which composite FKs have been skipped (for logging purposes)
         logged_skipped_fks = set()
-        
+
+        # Bulk-draw unconditional FK picks once per (node, fk_col) pair - the
+        # row loop below just consumes them by index instead of calling
+        # rng.choice per row. Maps fk_col -> (threshold, picks, guarded); a
+        # threshold of 1.0 means "always populate" and lets the row loop skip
+        # the RNG call. picks is None for PK-FK columns served from
+        # pre_allocated_pk. guarded is False when no generated row pre-assigned
+        # the column (e.g. via populate_columns), making the per-row
+        # already-assigned check provably dead and skippable.
+        fk_batch_picks = {}
+        # One bulk generator per node for all column draws; self.rng stays on
+        # the low-volume per-row paths
+        bulk_rng = rng_for_node(node, self.args.seed if self.args.seed is not None else 42)
+        # First pass: collect eligible unconditional FK columns and their metadata
+        eligible_fk_cols = []
+        eligible_col_metas = {}
+        for fk in self.fks:
+            if "{0}.{1}".format(fk.table_schema, fk.table_name) != node:
+                continue
+            # Conditional FKs are resolved per row against the discriminator
+            if fk.condition:
+                continue
+            fk_col = fk.column_name
+            if fk_col in eligible_col_metas:
+                continue
+            if fk_col in composite_columns_all:
+                continue
+            if cfg and any(sf["column"] == fk_col for sf in cfg.get("static_fks", [])):
+                continue
+            # Skip if this FK column is assigned via pre_allocated_pk_tuples
+            if pre_allocated_pk_tuples and fk_col in pk_fk_columns:
+                continue
+            col_meta = next((c for c in tmeta.columns if c.name == fk_col), None)
+            if not col_meta:
+                continue
+            eligible_fk_cols.append(fk_col)
+            eligible_col_metas[fk_col] = col_meta
+
+        # Compile step: resolve config into one FKPlan per column, then draw
+        fk_plans = build_fk_plans(node, eligible_fk_cols, eligible_col_metas,
+                                  parent_caches, self.fk_population_rates,
+                                  frozen_rates=self.fk_population_rates_frozen)
+        for plan in fk_plans:
+            if plan.threshold <= 0.0:
+                # A zero rate never populates this column - skip it (and its
+                # RNG draws) for the whole batch
+                continue
+            col_meta = eligible_col_metas[plan.col]
+            guarded = any(r.get(plan.col) is not None for r in rows if r)
+            if pre_allocated_pk and plan.col in pk_fk_columns:
+                # Values come from pre_allocated_pk[row_idx]; rate still applies per row
+                fk_batch_picks[plan.col] = (plan.threshold, None, guarded)
+                continue
+            if plan.n == 0 and col_meta.is_nullable == "NO":
+                # NOT NULL FK with no parent data - this will cause constraint violations
+                debug_print("{0}: WARNING - NOT NULL FK column {1} has no parent values available and will remain NULL, which may cause constraint violations".format(
+                    node, plan.col))
+            fk_batch_picks[plan.col] = (plan.threshold,
+                                        resolve_fk_column_batch(parent_caches_np.get(plan.col, plan.arr),
+                                                                len(rows), plan.threshold,
+                                                                col_meta.is_nullable, bulk_rng),
+                                        guarded)
+
         resolved_rows = []
         skipped_rows = 0
         
@@ -1846,9 +1925,10 @@ class FastSyntheticGenerator:
                 # Find the first FK whose condition matches
                 for fk in fk_list:
                     if evaluate_fk_condition(fk.condition, temp_row):
-                        parent_vals = conditional_fk_caches.get(fk.constraint_name, [])
-                        if parent_vals:
-                            temp_row[fk_col] = self.rng.choice(parent_vals)
+                        pool = conditional_pick_pools.get(fk.constraint_name)
+                        if pool:
+                            parent_vals, pool_size = pool
+                            temp_row[fk_col] = parent_vals[self.rng.randrange(pool_size)]
                             assigned_by_conditional_fk.add(fk_col)
                             debug_print("{0}: Conditional FK {1} matched (condition: {2}), assigned {3}={4}".format(
                                 node, fk.constraint_name, fk.condition, fk_col, temp_row[fk_col]))
@@ -1860,63 +1940,31 @@ class FastSyntheticGenerator:
                         debug_print("{0}: Skipping FK {1} - condition not met ({2})".format(
                             node, fk.constraint_name, fk.condition))
             
-            # Then, resolve unconditional FKs (skip columns already handled by conditional FKs)
-            for fk in self.fks:
-                if "{0}.{1}".format(fk.table_schema, fk.table_name) != node:
-                    continue
-                
-                # Skip conditional FKs - they were handled above
-                if fk.condition:
-                    continue
-                
-                fk_col = fk.column_name
-                
+            # Then, resolve unconditional FKs from the batch picks drawn above
+            # (skip columns already handled by conditional FKs)
+            # Default to 100% population for FKs - even nullable FKs should reference
+            # valid parent rows to maintain referential integrity. Use fk_population_rate
+            # config to specify a lower percentage if NULL values are desired.
+            for fk_col, (threshold, picks, guarded) in fk_batch_picks.items():
                 # Skip if already assigned by a conditional FK
                 if fk_col in assigned_by_conditional_fk:
                     continue
-                
-                if fk_col in composite_columns_all:
-                    continue
-                if cfg and any(sf["column"] == fk_col for sf in cfg.get("static_fks", [])):
-                    continue
-                
-                # Skip if this FK column was already assigned via pre_allocated_pk_tuples
-                if pre_allocated_pk_tuples and fk_col in pk_fk_columns:
-                    continue
-                
-                # Skip if FK value was already assigned (e.g., by populate_columns with explicit values)
-                if temp_row.get(fk_col) is not None:
+
+                # Skip if FK value was already assigned (e.g., by populate_columns
+                # with explicit values); unguarded columns skip the dead check
+                if guarded and temp_row.get(fk_col) is not None:
                     continue
-                
-                # Populate FK from parent values (works for both nullable and NOT NULL columns)
-                col_meta = next((c for c in tmeta.columns if c.name == fk_col), None)
-                if col_meta:
-                    # Check fk_population_rate for this column
-                    # Default to 100% population for FKs - even nullable FKs should reference
-                    # valid parent rows to maintain referential integrity. Use fk_population_rate
-                    # config to specify a lower percentage if NULL values are desired.
-                    fk_pop_rates = self.fk_population_rates.get(node, {})
-                    population_rate = fk_pop_rates.get(fk_col, 1.0)  # Default 100% population
-                    
-                    # Respect fk_population_rate: for nullable columns, only populate some rows
-                    should_populate = True
-                    if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                        should_populate = (self.rng.random() < population_rate)
-                    
-                    if should_populate:
-                        if pre_allocated_pk and fk_col in pk_fk_columns:
-                            temp_row[fk_col] = pre_allocated_pk[row_idx]
-                        else:
-                            parent_vals = parent_caches.get(fk_col, [])
-                            if parent_vals:
-                                temp_row[fk_col] = self.rng.choice(parent_vals)
-                            else:
-                                # No parent values available
-                                if col_meta.is_nullable == "NO":
-                                    # NOT NULL FK with no parent data - this will cause constraint violations
-                                    debug_print("{0}: WARNING - NOT NULL FK column {1} has no parent values available and will remain NULL, which may cause constraint violations".format(
-                                        node, fk_col))
-            
+
+                if picks is None:
+                    # PK-FK column served from pre-allocated parent values;
+                    # respect fk_population_rate for nullable columns
+                    if threshold >= 1.0 or self.rng.random() < threshold:
+                        temp_row[fk_col] = pre_allocated_pk[row_idx]
+                else:
+                    value = picks[row_idx]
+                    if value is not None:
+                        temp_row[fk_col] = value
+
             resolved_rows.append(temp_row)
         
         if skipped_rows > 0:
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
 """Utility functions and data structures for synthetic data generation"""
-import hashlib, hmac, re, random, sys
+import bisect, functools, hashlib, hmac, itertools, re, random, sys
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from collections import namedtuple
 
+# NumPy is optional - bulk sampling paths use it when available and fall back
+# to the stdlib random module otherwise
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 GLOBALS = {"debug": False}
 
 # Maximum attempt multiplier for generating unique values (used in generate_unique_value_pool)
@@ -155,6 +163,284 @@ def pseudonymize_value(value, key_bytes, kind="generic"):
 def rand_choice(rng, seq):
     return rng.choice(seq) if seq else None
 
+def as_parent_array(values):
+    """
+    Convert a parent value pool to a contiguous NumPy array once, so bulk
+    sampling reads a packed buffer instead of pointer-chasing boxed list
+    elements (and avoids per-call list coercion). Integers become int64;
+    anything else is stored as dtype=object to preserve Python values exactly.
+
+    Returns the original list unchanged when NumPy is unavailable.
+    """
+    if np is None or not values:
+        return values
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        try:
+            return np.asarray(values, dtype=np.int64)
+        except OverflowError:
+            # e.g. BIGINT UNSIGNED pools exceed int64; keep exact Python ints
+            pass
+    return np.asarray(values, dtype=object)
+
+def rng_for_node(node, seed):
+    """
+    Bulk RNG factory: one generator per table node, derived from the run seed
+    (same idiom as the per-thread generation rngs). Returns a NumPy PCG64
+    Generator when NumPy is available - PCG64 seeds and draws faster than the
+    stdlib Mersenne Twister for bulk sampling - otherwise a dedicated
+    random.Random stream.
+    """
+    node_seed = (seed ^ hash(node)) & (2**63 - 1)
+    if np is not None:
+        return np.random.default_rng(node_seed)
+    return random.Random(node_seed)
+
+def _resolve_fk_column_batch_np(parent_vals, num_rows, population_rate, rate_applies, rng):
+    """Vectorized kernel behind resolve_fk_column_batch (requires NumPy)."""
+    # Accepts a pre-built Generator (see rng_for_node) or seeds one from the stdlib rng
+    gen = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng.randrange(2**63))
+    # Accepts pre-converted arrays (see as_parent_array) to amortize coercion
+    parent_arr = parent_vals if isinstance(parent_vals, np.ndarray) else np.asarray(parent_vals)
+    picks = parent_arr[gen.integers(0, len(parent_arr), num_rows)].tolist()
+    if not rate_applies:
+        return picks
+    mask = gen.random(num_rows) < population_rate
+    return [v if m else None for v, m in zip(picks, mask.tolist())]
+
+def _resolve_fk_column_batch_py(parent_vals, num_rows, population_rate, rate_applies, rng):
+    """Pure-Python kernel behind resolve_fk_column_batch (stdlib fallback)."""
+    # rng.choices draws all picks in a single C-level call instead of
+    # dispatching rng.choice once per row
+    picks = rng.choices(parent_vals, k=num_rows)
+    if not rate_applies:
+        return picks
+    return [p if rng.random() < population_rate else None for p in picks]
+
+def freeze_fk_population_rates(fk_population_rates):
+    """
+    Flatten the nested {node: {fk_col: rate}} config into a hashable tuple of
+    ((node, fk_col), rate) items, sorted for a stable cache key. Call
+    lookup_fk_threshold.cache_clear() if the config is ever reloaded.
+    """
+    items = []
+    for node, rates in fk_population_rates.items():
+        for fk_col, rate in rates.items():
+            items.append(((node, fk_col), rate))
+    return tuple(sorted(items))
+
+@functools.lru_cache(maxsize=4096)
+def lookup_fk_threshold(node, fk_col, is_nullable_bool, frozen_rates):
+    """
+    Resolve the population threshold for one (node, fk_col) pair. The rates
+    config is fixed for a run, so the LRU cache turns the repeated per-batch
+    resolution into a single hash lookup after the first call.
+
+    Returns: population rate for applicable nullable columns, else 1.0
+    ("always populate").
+    """
+    rate = 1.0
+    for key, value in frozen_rates:
+        if key == (node, fk_col):
+            rate = value
+            break
+    return rate if (is_nullable_bool and rate < 1.0) else 1.0
+
+
+@dataclass(slots=True, frozen=True)
+class FKPlan:
+    """Compiled sampling plan for one unconditional FK column: the immutable
+    parent pool, its length, and the resolved population threshold. All config
+    decisions happen at plan-build time so row/batch loops stay minimal."""
+    col: str
+    arr: tuple
+    n: int
+    threshold: float
+    # Cumulative parent weights for skewed sampling; None means uniform
+    cdf: tuple = None
+
+
+def build_fk_plans(node, fk_columns, col_metas, parent_caches, fk_population_rates,
+                   parent_weights=None, frozen_rates=None):
+    """
+    Compile per-(table, fk_col) configuration into FKPlan entries, once per
+    batch. Resolves population thresholds through the cached lookup and
+    freezes each parent pool as a tuple. When parent_weights supplies relative
+    weights for a column's pool, the cumulative sum is precomputed here so
+    every draw is a single binary search instead of an O(n) scan.
+
+    Args:
+        node: "schema.table" key for the child table
+        fk_columns: iterable of FK column names to plan
+        col_metas: dict mapping column name -> column metadata
+        parent_caches: dict mapping column name -> parent value pool
+        fk_population_rates: nested {node: {fk_col: rate}} config
+        parent_weights: optional dict mapping column name -> per-value weights
+                        (same length as the pool); omitted columns sample uniformly
+        frozen_rates: optional pre-frozen snapshot of fk_population_rates (see
+                      freeze_fk_population_rates); callers that hold one avoid
+                      re-flattening the config on every batch
+
+    Returns: list of FKPlan in fk_columns order
+    """
+    if frozen_rates is None:
+        frozen_rates = freeze_fk_population_rates(fk_population_rates)
+    plans = []
+    for fk_col in fk_columns:
+        col_meta = col_metas[fk_col]
+        threshold = lookup_fk_threshold(node, fk_col, col_meta.is_nullable_bool, frozen_rates)
+        pool = tuple(parent_caches.get(fk_col, ()))
+        cdf = None
+        if parent_weights and fk_col in parent_weights:
+            weights = parent_weights[fk_col]
+            if len(weights) != len(pool):
+                raise ValueError("weights for {0} have length {1}, pool has {2}".format(
+                    fk_col, len(weights), len(pool)))
+            cdf = tuple(itertools.accumulate(weights))
+        plans.append(FKPlan(fk_col, pool, len(pool), threshold, cdf))
+    return plans
+
+
+def weighted_pick(plan, rng):
+    """Draw one parent value from a plan's pool honoring its weight CDF (or
+    uniformly when no CDF was compiled). O(log n) per draw via binary search.
+    Accepts a stdlib Random or a NumPy Generator (see rng_for_node)."""
+    if np is not None and isinstance(rng, np.random.Generator):
+        if plan.cdf is None:
+            return plan.arr[int(rng.integers(plan.n))]
+        return plan.arr[int(np.searchsorted(np.asarray(plan.cdf), rng.random() * plan.cdf[-1]))]
+    if plan.cdf is None:
+        return plan.arr[rng.randrange(plan.n)]
+    return plan.arr[bisect.bisect_left(plan.cdf, rng.random() * plan.cdf[-1])]
+
+
+def weighted_picks(plan, num_rows, rng):
+    """Bulk form of weighted_pick: one C-level call per column per batch.
+    Accepts a stdlib Random (choices) or a NumPy Generator (vectorized
+    index draws plus searchsorted), mirroring resolve_fk_column_batch."""
+    if np is not None and isinstance(rng, np.random.Generator):
+        if plan.cdf is None:
+            indexes = rng.integers(0, plan.n, num_rows)
+        else:
+            cdf = np.asarray(plan.cdf)
+            indexes = np.searchsorted(cdf, rng.random(num_rows) * cdf[-1])
+        arr = plan.arr
+        return [arr[i] for i in indexes]
+    if plan.cdf is None:
+        return rng.choices(plan.arr, k=num_rows)
+    return rng.choices(plan.arr, cum_weights=plan.cdf, k=num_rows)
+
+
+def row_from_picks(plans, picks):
+    """Build one row dict in a single pass from parallel plans/picks lists,
+    dropping None picks. One dict-from-iter construction instead of a
+    __setitem__ call per populated column."""
+    return {plan.col: v for plan, v in zip(plans, picks) if v is not None}
+
+
+def _resolve_fks_batch_fastpath(plans, num_rows, rng):
+    """Stripped-down batch resolver for the common shape: every planned column
+    is 100%-populated from a non-empty pool. No threshold branches and no
+    None filtering - one bulk draw per column, then a transpose."""
+    cols = [plan.col for plan in plans]
+    col_picks = [weighted_picks(plan, num_rows, rng) for plan in plans]
+    return [dict(zip(cols, row)) for row in zip(*col_picks)]
+
+
+def resolve_fks_rows(plans, num_rows, rng):
+    """
+    Resolve all planned FK columns for a batch, returning one dict per row.
+
+    Dispatches to _resolve_fks_batch_fastpath when every plan has a full
+    population threshold and a non-empty pool - the shape produced by a
+    default config with no fk_population_rates - so the overwhelmingly
+    common case pays for no per-column rate handling. Otherwise each
+    column goes through the threshold-aware batch resolver and unpopulated
+    cells are dropped per row. Either rng flavor from rng_for_node works -
+    both paths only need random()/bulk draws.
+    """
+    if not plans:
+        return [{} for _ in range(num_rows)]
+    if all(plan.threshold >= 1.0 and plan.n > 0 for plan in plans):
+        return _resolve_fks_batch_fastpath(plans, num_rows, rng)
+    col_picks = []
+    for plan in plans:
+        if plan.threshold <= 0.0 or plan.n == 0:
+            col_picks.append([None] * num_rows)
+            continue
+        picks = weighted_picks(plan, num_rows, rng)
+        if plan.threshold < 1.0:
+            picks = [v if rng.random() < plan.threshold else None for v in picks]
+        col_picks.append(picks)
+    return [row_from_picks(plans, row) for row in zip(*col_picks)]
+
+
+class FKBatchResult:
+    """
+    Columnar (structure-of-arrays) container for batch-resolved FK columns.
+
+    Each column is a flat values list with None marking unpopulated rows, so
+    counting and membership checks are a single pass over one list instead of
+    per-row dict probes. Row dicts are only materialized at the DML boundary
+    via to_rows().
+    """
+    __slots__ = ("num_rows", "columns")
+
+    def __init__(self, num_rows):
+        self.num_rows = num_rows
+        self.columns = {}
+
+    def add_column(self, name, values):
+        if len(values) != self.num_rows:
+            raise ValueError("column {0} has {1} values, expected {2}".format(
+                name, len(values), self.num_rows))
+        self.columns[name] = values
+
+    def populated_count(self, name):
+        return sum(1 for v in self.columns.get(name, ()) if v is not None)
+
+    def to_rows(self):
+        """Transpose to per-row dicts, omitting unpopulated (None) cells"""
+        if not self.columns:
+            return [{} for _ in range(self.num_rows)]
+        colnames = list(self.columns.keys())
+        value_lists = [self.columns[c] for c in colnames]
+        return [{c: v for c, v in zip(colnames, row_vals) if v is not None}
+                for row_vals in zip(*value_lists)]
+
+
+def resolve_fk_column_batch(parent_vals, num_rows, population_rate=1.0, is_nullable="YES", rng=None):
+    """
+    Draw FK values for a whole batch of rows in one pass.
+
+    Replaces the per-row rng.random()/rng.choice() pattern with bulk draws:
+    one Bernoulli pass for the population mask and one index-sampling pass
+    for the picks. Dispatches to the vectorized NumPy kernel when available,
+    otherwise to the stdlib fallback; both kernels share a signature so
+    faster implementations can be slotted in behind it.
+
+    Args:
+        parent_vals: sequence of candidate parent values
+        num_rows: number of rows to draw values for
+        population_rate: fraction of rows to populate (applies to nullable columns only)
+        is_nullable: "YES"/"NO" as reported by information_schema
+        rng: random.Random instance (also seeds the NumPy generator for determinism)
+
+    Returns: list of length num_rows where unpopulated rows hold None
+    """
+    if rng is None:
+        rng = random
+    if parent_vals is None or len(parent_vals) == 0:
+        return [None] * num_rows
+
+    # NOT NULL columns and unconfigured rates always populate
+    rate_applies = (is_nullable == "YES" and population_rate < 1.0)
+    if rate_applies and population_rate <= 0.0:
+        # A zero rate can never populate - skip the RNG entirely
+        return [None] * num_rows
+
+    kernel = _resolve_fk_column_batch_np if np is not None else _resolve_fk_column_batch_py
+    return kernel(parent_vals, num_rows, population_rate, rate_applies, rng)
+
 def rand_decimal_str(rng, precision, scale):
     whole_digits = precision - scale
     max_whole = 10**whole_digits - 1 if whole_digits > 0 else 0
@@ -331,9 +617,53 @@ def generate_value_with_config(rng, col, config=None):
     return None
 
 
-ColumnMeta = namedtuple("ColumnMeta", ["name","data_type","is_nullable","column_type","column_key","extra","char_max_length","numeric_precision","numeric_scale","column_default"])
-FKMeta = namedtuple("FKMeta", ["constraint_name","table_schema","table_name","column_name","referenced_table_schema","referenced_table_name","referenced_column_name","is_logical","condition"])
-TableMeta = namedtuple("TableMeta", ["schema","name","columns","pk_columns","auto_increment","engine"])
+# Metadata records are slotted frozen dataclasses: no per-instance __dict__
+# (these are created once per column/FK/table across every batch), fixed-offset
+# attribute loads, and hashability for use as cache keys.
+@dataclass(slots=True, frozen=True)
+class ColumnMeta:
+    """Column metadata from information_schema. is_nullable keeps the raw
+    "YES"/"NO" string for SQL emission; hot paths read is_nullable_bool
+    instead of repeating the string compare."""
+    name: str
+    data_type: str
+    is_nullable: str
+    column_type: str
+    column_key: str
+    extra: str
+    char_max_length: int
+    numeric_precision: int
+    numeric_scale: int
+    column_default: str
+
+    @property
+    def is_nullable_bool(self):
+        return self.is_nullable == "YES"
+
+
+@dataclass(slots=True, frozen=True)
+class FKMeta:
+    constraint_name: str
+    table_schema: str
+    table_name: str
+    column_name: str
+    referenced_table_schema: str
+    referenced_table_name: str
+    referenced_column_name: str
+    is_logical: bool
+    condition: str
+
+
+@dataclass(slots=True, frozen=True)
+class TableMeta:
+    schema: str
+    name: str
+    columns: list
+    pk_columns: list
+    auto_increment: bool
+    engine: str
+
+
 UniqueConstraint = namedtuple("UniqueConstraint", ["constraint_name","columns"])
 
 def parse_fk_condition(condition_str):
@@ -2,26 +2,51 @@
 """Unit tests for nullable FK population feature"""
 import unittest
 import random
-from collections import defaultdict
-from generate_synthetic_data_utils import ColumnMeta, FKMeta
+from dataclasses import dataclass, field
+from unittest.mock import patch
+from generate_synthetic_data_utils import (FKBatchResult, as_parent_array,
+                                           build_fk_plans, freeze_fk_population_rates,
+                                           resolve_fks_rows, row_from_picks,
+                                           weighted_pick, weighted_picks,
+                                           _resolve_fks_batch_fastpath,
+                                           lookup_fk_threshold, np,
+                                           resolve_fk_column_batch, rng_for_node,
+                                           _resolve_fk_column_batch_np,
+                                           _resolve_fk_column_batch_py)
 
+# One root seed for the whole module: each test derives its own independent
+# generator from it and a stable per-test key, so the stream a test sees does
+# not depend on which other tests ran first (str seeds hash via sha512, not
+# the randomized builtin hash).
+_ROOT_SEED = 42
 
+def _spawn_rng(key):
+    """Return a deterministic random.Random derived from the root seed and a
+    stable per-test key such as self.id()."""
+    return random.Random("{0}:{1}".format(_ROOT_SEED, key))
+
+
+@dataclass(slots=True, frozen=True)
 class MockColumnMeta:
     """Mock column metadata for testing"""
-    def __init__(self, name, is_nullable="YES"):
-        self.name = name
-        self.is_nullable = is_nullable
-        self.data_type = "int"
-        self.column_type = "int(11)"
+    name: str
+    is_nullable: str = "YES"
+    data_type: str = "int"
+    column_type: str = "int(11)"
+
+    @property
+    def is_nullable_bool(self):
+        # Mirrors ColumnMeta: bool form so hot loops avoid the string compare
+        return self.is_nullable == "YES"
 
 
+@dataclass(slots=True, frozen=True)
 class MockTableMeta:
     """Mock table metadata for testing"""
-    def __init__(self, columns, pk_columns=None):
-        self.columns = columns
-        self.pk_columns = pk_columns or []
-        self.schema = "db"
-        self.name = "test"
+    columns: list
+    pk_columns: list = field(default_factory=list)
+    schema: str = "db"
+    name: str = "test"
 
 
 class TestNullableFKPopulation(unittest.TestCase):
@@ -33,7 +58,7 @@ class TestNullableFKPopulation(unittest.TestCase):
         node = "db.P"
         parent_caches = {"U_ID": [1, 2, 3, 4, 5]}  # Parent values available
         fk_population_rates = {}  # No explicit population rate
-        rng = random.Random(42)
+        rng = _spawn_rng(self.id())
         
         # Mock column metadata for nullable FK
         col_meta = MockColumnMeta("U_ID", is_nullable="YES")
@@ -42,23 +67,21 @@ class TestNullableFKPopulation(unittest.TestCase):
         temp_row = {}  # Start with empty row
         fk_col = "U_ID"
         
-        # Skip if FK value was already assigned
-        if temp_row.get(fk_col) is not None:
-            pass  # Already assigned
-        else:
-            # Populate FK from parent values (works for both nullable and NOT NULL columns)
-            fk_pop_rates = fk_population_rates.get(node, {})
-            population_rate = fk_pop_rates.get(fk_col, 1.0)  # Default 100% population
-            
-            # Respect fk_population_rate
-            should_populate = True
-            if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                should_populate = (rng.random() < population_rate)
-            
-            if should_populate:
-                parent_vals = parent_caches.get(fk_col, [])
-                if parent_vals:
-                    temp_row[fk_col] = rng.choice(parent_vals)
+        # temp_row is freshly created, so the already-assigned guard is provably
+        # False here and skipped (see test_already_assigned_fk_not_overwritten)
+        # Populate FK from parent values (works for both nullable and NOT NULL columns)
+        fk_pop_rates = fk_population_rates.get(node, {})
+        population_rate = fk_pop_rates.get(fk_col, 1.0)  # Default 100% population
+        
+        # Respect fk_population_rate
+        # Loop-invariant threshold: 1.0 means "always populate" and skips the RNG call
+        threshold = population_rate if (col_meta.is_nullable_bool and population_rate < 1.0) else 1.0
+        
+        if threshold >= 1.0 or rng.random() < threshold:
+            parent_vals = parent_caches.get(fk_col, [])
+            n = len(parent_vals)
+            if n:
+                temp_row[fk_col] = parent_vals[rng.randrange(n)]
         
         # Verify: nullable FK should be populated with a value from parent
         self.assertIsNotNone(temp_row.get("U_ID"))
@@ -69,27 +92,25 @@ class TestNullableFKPopulation(unittest.TestCase):
         node = "db.P"
         parent_caches = {"U_ID": [1, 2, 3, 4, 5]}
         fk_population_rates = {}
-        rng = random.Random(42)
+        rng = _spawn_rng(self.id())
         
         col_meta = MockColumnMeta("U_ID", is_nullable="NO")
         
         temp_row = {}
         fk_col = "U_ID"
         
-        if temp_row.get(fk_col) is not None:
-            pass
-        else:
-            fk_pop_rates = fk_population_rates.get(node, {})
-            population_rate = fk_pop_rates.get(fk_col, 1.0)
-            
-            should_populate = True
-            if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                should_populate = (rng.random() < population_rate)
-            
-            if should_populate:
-                parent_vals = parent_caches.get(fk_col, [])
-                if parent_vals:
-                    temp_row[fk_col] = rng.choice(parent_vals)
+        # temp_row is freshly created - no already-assigned guard needed
+        fk_pop_rates = fk_population_rates.get(node, {})
+        population_rate = fk_pop_rates.get(fk_col, 1.0)
+        
+        # Loop-invariant threshold: 1.0 means "always populate" and skips the RNG call
+        threshold = population_rate if (col_meta.is_nullable_bool and population_rate < 1.0) else 1.0
+        
+        if threshold >= 1.0 or rng.random() < threshold:
+            parent_vals = parent_caches.get(fk_col, [])
+            n = len(parent_vals)
+            if n:
+                temp_row[fk_col] = parent_vals[rng.randrange(n)]
         
         self.assertIsNotNone(temp_row.get("U_ID"))
         self.assertIn(temp_row["U_ID"], [1, 2, 3, 4, 5])
@@ -99,7 +120,7 @@ class TestNullableFKPopulation(unittest.TestCase):
         node = "db.P"
         parent_caches = {"U_ID": [1, 2, 3, 4, 5]}
         fk_population_rates = {}
-        rng = random.Random(42)
+        rng = _spawn_rng(self.id())
         
         col_meta = MockColumnMeta("U_ID", is_nullable="YES")
         
@@ -114,14 +135,14 @@ class TestNullableFKPopulation(unittest.TestCase):
             fk_pop_rates = fk_population_rates.get(node, {})
             population_rate = fk_pop_rates.get(fk_col, 1.0)
             
-            should_populate = True
-            if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                should_populate = (rng.random() < population_rate)
+            # Loop-invariant threshold: 1.0 means "always populate" and skips the RNG call
+            threshold = population_rate if (col_meta.is_nullable_bool and population_rate < 1.0) else 1.0
             
-            if should_populate:
+            if threshold >= 1.0 or rng.random() < threshold:
                 parent_vals = parent_caches.get(fk_col, [])
-                if parent_vals:
-                    temp_row[fk_col] = rng.choice(parent_vals)
+                n = len(parent_vals)
+                if n:
+                    temp_row[fk_col] = parent_vals[rng.randrange(n)]
         
         # Verify: original value is preserved
         self.assertEqual(temp_row["U_ID"], 999)
@@ -135,38 +156,21 @@ class TestFKPopulationRate(unittest.TestCase):
         node = "db.P"
         parent_caches = {"U_ID": [1, 2, 3, 4, 5]}
         fk_population_rates = {node: {"U_ID": 0.5}}  # 50% population rate
-        rng = random.Random(42)
-        
+        rng = _spawn_rng(self.id())
+
         col_meta = MockColumnMeta("U_ID", is_nullable="YES")
-        
-        populated_count = 0
-        null_count = 0
+
         num_rows = 1000
-        
-        for _ in range(num_rows):
-            temp_row = {}
-            fk_col = "U_ID"
-            
-            if temp_row.get(fk_col) is not None:
-                pass
-            else:
-                fk_pop_rates = fk_population_rates.get(node, {})
-                population_rate = fk_pop_rates.get(fk_col, 1.0)
-                
-                should_populate = True
-                if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                    should_populate = (rng.random() < population_rate)
-                
-                if should_populate:
-                    parent_vals = parent_caches.get(fk_col, [])
-                    if parent_vals:
-                        temp_row[fk_col] = rng.choice(parent_vals)
-            
-            if temp_row.get("U_ID") is not None:
-                populated_count += 1
-            else:
-                null_count += 1
-        
+        fk_col = "U_ID"
+        population_rate = fk_population_rates.get(node, {}).get(fk_col, 1.0)
+
+        # Batch resolution: one call draws the whole column, stored columnar
+        result = FKBatchResult(num_rows)
+        result.add_column(fk_col, resolve_fk_column_batch(parent_caches[fk_col], num_rows,
+                                                          population_rate, col_meta.is_nullable, rng))
+
+        populated_count = result.populated_count(fk_col)
+
         # Verify: approximately 50% populated (with some margin)
         population_percentage = populated_count / num_rows
         self.assertGreater(population_percentage, 0.4)
@@ -177,35 +181,30 @@ class TestFKPopulationRate(unittest.TestCase):
         node = "db.P"
         parent_caches = {"U_ID": [1, 2, 3, 4, 5]}
         fk_population_rates = {}  # No explicit rate - defaults to 100%
-        rng = random.Random(42)
+        rng = _spawn_rng(self.id())
         
         col_meta = MockColumnMeta("U_ID", is_nullable="YES")
         
         populated_count = 0
         num_rows = 100
-        
-        for _ in range(num_rows):
+        fk_col = "U_ID"
+        parent_vals = parent_caches.get(fk_col, [])
+        # Bulk-draw all picks up front; the loop just consumes them by index
+        picks = rng.choices(parent_vals, k=num_rows)
+        # Loop-invariant threshold: 1.0 means "always populate" and skips the RNG call
+        population_rate = fk_population_rates.get(node, {}).get(fk_col, 1.0)
+        threshold = population_rate if (col_meta.is_nullable_bool and population_rate < 1.0) else 1.0
+
+        for i in range(num_rows):
+            # temp_row is freshly created each iteration - no already-assigned guard needed
             temp_row = {}
-            fk_col = "U_ID"
-            
-            if temp_row.get(fk_col) is not None:
-                pass
-            else:
-                fk_pop_rates = fk_population_rates.get(node, {})
-                population_rate = fk_pop_rates.get(fk_col, 1.0)
-                
-                should_populate = True
-                if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                    should_populate = (rng.random() < population_rate)
-                
-                if should_populate:
-                    parent_vals = parent_caches.get(fk_col, [])
-                    if parent_vals:
-                        temp_row[fk_col] = rng.choice(parent_vals)
-            
+
+            if (threshold >= 1.0 or rng.random() < threshold) and parent_vals:
+                temp_row[fk_col] = picks[i]
+
             if temp_row.get("U_ID") is not None:
                 populated_count += 1
-        
+
         # Verify: 100% populated
         self.assertEqual(populated_count, num_rows)
     
@@ -214,40 +213,190 @@ class TestFKPopulationRate(unittest.TestCase):
         node = "db.P"
         parent_caches = {"U_ID": [1, 2, 3, 4, 5]}
         fk_population_rates = {node: {"U_ID": 0.5}}  # 50% rate but should be ignored
-        rng = random.Random(42)
+        rng = _spawn_rng(self.id())
         
         col_meta = MockColumnMeta("U_ID", is_nullable="NO")  # NOT NULL
         
         populated_count = 0
         num_rows = 100
-        
-        for _ in range(num_rows):
+        fk_col = "U_ID"
+        parent_vals = parent_caches.get(fk_col, [])
+        # Bulk-draw all picks up front; the loop just consumes them by index
+        picks = rng.choices(parent_vals, k=num_rows)
+        # Loop-invariant threshold: 1.0 means "always populate" and skips the RNG call.
+        # Key: for NOT NULL columns, population_rate is ignored
+        population_rate = fk_population_rates.get(node, {}).get(fk_col, 1.0)
+        threshold = population_rate if (col_meta.is_nullable_bool and population_rate < 1.0) else 1.0
+
+        for i in range(num_rows):
+            # temp_row is freshly created each iteration - no already-assigned guard needed
             temp_row = {}
-            fk_col = "U_ID"
-            
-            if temp_row.get(fk_col) is not None:
-                pass
-            else:
-                fk_pop_rates = fk_population_rates.get(node, {})
-                population_rate = fk_pop_rates.get(fk_col, 1.0)
-                
-                should_populate = True
-                # Key: for NOT NULL columns, population_rate is ignored
-                if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                    should_populate = (rng.random() < population_rate)
-                
-                if should_populate:
-                    parent_vals = parent_caches.get(fk_col, [])
-                    if parent_vals:
-                        temp_row[fk_col] = rng.choice(parent_vals)
-            
+
+            if (threshold >= 1.0 or rng.random() < threshold) and parent_vals:
+                temp_row[fk_col] = picks[i]
+
             if temp_row.get("U_ID") is not None:
                 populated_count += 1
-        
+
         # Verify: 100% populated for NOT NULL columns regardless of rate
         self.assertEqual(populated_count, num_rows)
 
 
+class TestResolveFKColumnBatch(unittest.TestCase):
+    """Test the batched FK column resolution helper"""
+
+    def test_batch_values_from_parent_pool(self):
+        """Test that all batch values come from the parent pool at 100% rate"""
+        rng = _spawn_rng(self.id())
+        values = resolve_fk_column_batch([1, 2, 3, 4, 5], 20, 1.0, "YES", rng)
+
+        self.assertEqual(len(values), 20)
+        for v in values:
+            self.assertIn(v, [1, 2, 3, 4, 5])
+
+    def test_batch_not_null_ignores_rate(self):
+        """Test that NOT NULL columns are fully populated regardless of rate"""
+        rng = _spawn_rng(self.id())
+        values = resolve_fk_column_batch([1, 2, 3, 4, 5], 20, 0.5, "NO", rng)
+
+        self.assertEqual(len(values), 20)
+        for v in values:
+            self.assertIsNotNone(v)
+            self.assertIn(v, [1, 2, 3, 4, 5])
+
+    def test_batch_zero_rate_never_populates(self):
+        """Test that a 0.0 rate on a nullable column yields all-None values"""
+        rng = _spawn_rng(self.id())
+        values = resolve_fk_column_batch([1, 2, 3, 4, 5], 20, 0.0, "YES", rng)
+
+        self.assertEqual(values, [None] * 20)
+
+    def test_batch_zero_rate_ignored_for_not_null(self):
+        """Test that a 0.0 rate is ignored for NOT NULL columns"""
+        rng = _spawn_rng(self.id())
+        values = resolve_fk_column_batch([1, 2, 3, 4, 5], 20, 0.0, "NO", rng)
+
+        for v in values:
+            self.assertIsNotNone(v)
+
+    def test_batch_full_rate_always_populates(self):
+        """Test that a 1.0 rate populates every row"""
+        rng = _spawn_rng(self.id())
+        values = resolve_fk_column_batch([1, 2, 3, 4, 5], 20, 1.0, "YES", rng)
+
+        for v in values:
+            self.assertIsNotNone(v)
+
+    def test_batch_accepts_prebuilt_parent_array(self):
+        """Test that a pool pre-converted by as_parent_array samples correctly"""
+        rng = _spawn_rng(self.id())
+        pool = as_parent_array([1, 2, 3, 4, 5])
+        values = resolve_fk_column_batch(pool, 20, 1.0, "YES", rng)
+
+        self.assertEqual(len(values), 20)
+        for v in values:
+            self.assertIn(v, [1, 2, 3, 4, 5])
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_prebuilt_parent_array_beyond_int64(self):
+        """Test that pools exceeding int64 fall back to exact object storage"""
+        rng = _spawn_rng(self.id())
+        big = 2**63  # BIGINT UNSIGNED territory
+        pool = as_parent_array([big, big + 1, big + 2])
+
+        self.assertEqual(pool.dtype, np.dtype(object))
+
+        values = resolve_fk_column_batch(pool, 20, 1.0, "YES", rng)
+        for v in values:
+            self.assertIn(v, [big, big + 1, big + 2])
+
+    def test_batch_empty_parent_pool(self):
+        """Test that an empty parent pool yields all-None values"""
+        rng = _spawn_rng(self.id())
+        values = resolve_fk_column_batch([], 20, 1.0, "YES", rng)
+
+        self.assertEqual(values, [None] * 20)
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_vectorized_kernel_parity(self):
+        """Test that the vectorized and pure-Python kernels agree on the populated distribution"""
+        parent_vals = [1, 2, 3, 4, 5]
+        num_rows = 10000
+
+        np_values = _resolve_fk_column_batch_np(parent_vals, num_rows, 0.5, True, _spawn_rng(self.id() + ':np'))
+        py_values = _resolve_fk_column_batch_py(parent_vals, num_rows, 0.5, True, _spawn_rng(self.id() + ':py'))
+
+        np_rate = sum(1 for v in np_values if v is not None) / num_rows
+        py_rate = sum(1 for v in py_values if v is not None) / num_rows
+        self.assertAlmostEqual(np_rate, py_rate, delta=0.05)
+
+        self.assertEqual(set(v for v in np_values if v is not None) - set(parent_vals), set())
+
+
+class TestThresholdLookup(unittest.TestCase):
+    """Test the cached (node, fk_col) -> population threshold resolution"""
+
+    def test_threshold_resolution(self):
+        """Test configured, NOT NULL, and unconfigured threshold cases"""
+        frozen = freeze_fk_population_rates({"db.P": {"U_ID": 0.5}})
+
+        self.assertEqual(lookup_fk_threshold("db.P", "U_ID", True, frozen), 0.5)
+        # NOT NULL columns ignore the configured rate
+        self.assertEqual(lookup_fk_threshold("db.P", "U_ID", False, frozen), 1.0)
+        # Unconfigured pairs default to always-populate
+        self.assertEqual(lookup_fk_threshold("db.P", "OTHER_ID", True, frozen), 1.0)
+        self.assertEqual(lookup_fk_threshold("db.Q", "U_ID", True, frozen), 1.0)
+
+
+class TestFKBatchResult(unittest.TestCase):
+    """Test the columnar FK batch result container"""
+
+    def test_populated_count(self):
+        """Test that populated_count ignores None cells"""
+        result = FKBatchResult(4)
+        result.add_column("U_ID", [1, None, 3, None])
+
+        self.assertEqual(result.populated_count("U_ID"), 2)
+        self.assertEqual(result.populated_count("MISSING"), 0)
+
+    def test_to_rows_omits_unpopulated_cells(self):
+        """Test that row dicts only contain populated columns"""
+        result = FKBatchResult(3)
+        result.add_column("U_ID", [1, None, 3])
+        result.add_column("DEPT_ID", [100, 200, None])
+
+        rows = result.to_rows()
+
+        self.assertEqual(rows, [{"U_ID": 1, "DEPT_ID": 100},
+                                {"DEPT_ID": 200},
+                                {"U_ID": 3}])
+
+    def test_column_length_mismatch_rejected(self):
+        """Test that a wrong-length column raises"""
+        result = FKBatchResult(3)
+
+        with self.assertRaises(ValueError):
+            result.add_column("U_ID", [1, 2])
+
+
+class TestRngForNode(unittest.TestCase):
+    """Test the per-node bulk RNG factory"""
+
+    def test_same_node_and_seed_is_deterministic(self):
+        """Test that the same (node, seed) pair yields an identical stream"""
+        a = rng_for_node("db.P", 42)
+        b = rng_for_node("db.P", 42)
+        self.assertEqual([a.random() for _ in range(5)],
+                         [b.random() for _ in range(5)])
+
+    def test_batch_draws_are_deterministic(self):
+        """Test that batch FK draws repeat exactly for a given node generator"""
+        values_a = resolve_fk_column_batch([1, 2, 3, 4, 5], 50, 1.0, "YES", rng_for_node("db.P", 42))
+        values_b = resolve_fk_column_batch([1, 2, 3, 4, 5], 50, 1.0, "YES", rng_for_node("db.P", 42))
+
+        self.assertEqual(values_a, values_b)
+
+
 class TestNoParentValues(unittest.TestCase):
     """Test handling when no parent values are available"""
     
@@ -256,27 +405,25 @@ class TestNoParentValues(unittest.TestCase):
         node = "db.P"
         parent_caches = {}  # No parent values
         fk_population_rates = {}
-        rng = random.Random(42)
+        rng = _spawn_rng(self.id())
         
         col_meta = MockColumnMeta("U_ID", is_nullable="YES")
         
         temp_row = {}
         fk_col = "U_ID"
         
-        if temp_row.get(fk_col) is not None:
-            pass
-        else:
-            fk_pop_rates = fk_population_rates.get(node, {})
-            population_rate = fk_pop_rates.get(fk_col, 1.0)
-            
-            should_populate = True
-            if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                should_populate = (rng.random() < population_rate)
-            
-            if should_populate:
-                parent_vals = parent_caches.get(fk_col, [])
-                if parent_vals:
-                    temp_row[fk_col] = rng.choice(parent_vals)
+        # temp_row is freshly created - no already-assigned guard needed
+        fk_pop_rates = fk_population_rates.get(node, {})
+        population_rate = fk_pop_rates.get(fk_col, 1.0)
+        
+        # Loop-invariant threshold: 1.0 means "always populate" and skips the RNG call
+        threshold = population_rate if (col_meta.is_nullable_bool and population_rate < 1.0) else 1.0
+        
+        if threshold >= 1.0 or rng.random() < threshold:
+            parent_vals = parent_caches.get(fk_col, [])
+            n = len(parent_vals)
+            if n:
+                temp_row[fk_col] = parent_vals[rng.randrange(n)]
         
         # Verify: FK remains None (not in temp_row)
         self.assertNotIn("U_ID", temp_row)
@@ -286,7 +433,7 @@ class TestNoParentValues(unittest.TestCase):
         node = "db.P"
         parent_caches = {}  # No parent values
         fk_population_rates = {}
-        rng = random.Random(42)
+        rng = _spawn_rng(self.id())
         
         col_meta = MockColumnMeta("U_ID", is_nullable="NO")
         
@@ -294,24 +441,22 @@ class TestNoParentValues(unittest.TestCase):
         fk_col = "U_ID"
         warning_logged = False
         
-        if temp_row.get(fk_col) is not None:
-            pass
-        else:
-            fk_pop_rates = fk_population_rates.get(node, {})
-            population_rate = fk_pop_rates.get(fk_col, 1.0)
-            
-            should_populate = True
-            if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                should_populate = (rng.random() < population_rate)
-            
-            if should_populate:
-                parent_vals = parent_caches.get(fk_col, [])
-                if parent_vals:
-                    temp_row[fk_col] = rng.choice(parent_vals)
-                else:
-                    # No parent values available
-                    if col_meta.is_nullable == "NO":
-                        warning_logged = True
+        # temp_row is freshly created - no already-assigned guard needed
+        fk_pop_rates = fk_population_rates.get(node, {})
+        population_rate = fk_pop_rates.get(fk_col, 1.0)
+        
+        # Loop-invariant threshold: 1.0 means "always populate" and skips the RNG call
+        threshold = population_rate if (col_meta.is_nullable_bool and population_rate < 1.0) else 1.0
+        
+        if threshold >= 1.0 or rng.random() < threshold:
+            parent_vals = parent_caches.get(fk_col, [])
+            n = len(parent_vals)
+            if n:
+                temp_row[fk_col] = parent_vals[rng.randrange(n)]
+            else:
+                # No parent values available
+                if col_meta.is_nullable == "NO":
+                    warning_logged = True
         
         # Verify: FK not assigned (NULL) and warning would be logged
         self.assertNotIn("U_ID", temp_row)
@@ -330,7 +475,7 @@ class TestMultipleNullableFKs(unittest.TestCase):
             "CATEGORY_ID": [10, 20, 30, 40]
         }
         fk_population_rates = {}
-        rng = random.Random(42)
+        rng = _spawn_rng(self.id())
         
         fk_columns = ["U_ID", "DEPT_ID", "CATEGORY_ID"]
         col_metas = {
@@ -339,25 +484,15 @@ class TestMultipleNullableFKs(unittest.TestCase):
             "CATEGORY_ID": MockColumnMeta("CATEGORY_ID", is_nullable="YES")
         }
         
-        temp_row = {}
-        
-        for fk_col in fk_columns:
-            col_meta = col_metas[fk_col]
-            
-            if temp_row.get(fk_col) is not None:
-                continue
-            
-            fk_pop_rates = fk_population_rates.get(node, {})
-            population_rate = fk_pop_rates.get(fk_col, 1.0)
-            
-            should_populate = True
-            if col_meta.is_nullable == "YES" and population_rate < 1.0:
-                should_populate = (rng.random() < population_rate)
-            
-            if should_populate:
-                parent_vals = parent_caches.get(fk_col, [])
-                if parent_vals:
-                    temp_row[fk_col] = rng.choice(parent_vals)
+        # Compile all per-column config once, then the row loop only touches plans
+        plans = build_fk_plans(node, fk_columns, col_metas, parent_caches, fk_population_rates)
+
+        # Draw all picks first, then build the row dict in one shot
+        picks = [plan.arr[rng.randrange(plan.n)]
+                 if plan.n and (plan.threshold >= 1.0 or rng.random() < plan.threshold)
+                 else None
+                 for plan in plans]
+        temp_row = row_from_picks(plans, picks)
         
         # Verify all FKs populated
         self.assertIsNotNone(temp_row.get("U_ID"))
@@ -368,5 +503,127 @@ class TestMultipleNullableFKs(unittest.TestCase):
         self.assertIn(temp_row["CATEGORY_ID"], [10, 20, 30, 40])
 
 
+class TestWeightedFKDistribution(unittest.TestCase):
+    """Test weighted parent sampling through the precomputed CDF"""
+
+    def test_weighted_fk_distribution(self):
+        """Test that a [0.9, 0.1] weighting produces the expected skew"""
+        node = "db.P"
+        parent_caches = {"U_ID": [1, 2]}
+        col_metas = {"U_ID": MockColumnMeta("U_ID", is_nullable="YES")}
+        rng = _spawn_rng(self.id())
+
+        plans = build_fk_plans(node, ["U_ID"], col_metas, parent_caches, {},
+                               parent_weights={"U_ID": [0.9, 0.1]})
+        plan = plans[0]
+        self.assertIsNotNone(plan.cdf)
+
+        num_samples = 10000
+        picks = weighted_picks(plan, num_samples, rng)
+        heavy_rate = sum(1 for v in picks if v == 1) / num_samples
+        self.assertGreaterEqual(heavy_rate, 0.87)
+        self.assertLessEqual(heavy_rate, 0.93)
+
+        # Scalar draw path agrees with the bulk path
+        scalar_picks = [weighted_pick(plan, rng) for _ in range(num_samples)]
+        scalar_rate = sum(1 for v in scalar_picks if v == 1) / num_samples
+        self.assertAlmostEqual(scalar_rate, heavy_rate, delta=0.03)
+
+    def test_unweighted_plan_samples_uniformly(self):
+        """Test that plans without weights keep uniform sampling"""
+        parent_caches = {"U_ID": [1, 2]}
+        col_metas = {"U_ID": MockColumnMeta("U_ID", is_nullable="YES")}
+        rng = _spawn_rng(self.id())
+
+        plan = build_fk_plans("db.P", ["U_ID"], col_metas, parent_caches, {})[0]
+        self.assertIsNone(plan.cdf)
+
+        picks = weighted_picks(plan, 10000, rng)
+        rate = sum(1 for v in picks if v == 1) / 10000
+        self.assertGreaterEqual(rate, 0.45)
+        self.assertLessEqual(rate, 0.55)
+
+    @unittest.skipIf(np is None, "NumPy not installed")
+    def test_weighted_picks_with_bulk_generator(self):
+        """Test that the NumPy Generator flavor from rng_for_node also draws weighted"""
+        parent_caches = {"U_ID": [1, 2]}
+        col_metas = {"U_ID": MockColumnMeta("U_ID", is_nullable="YES")}
+        rng = rng_for_node("db.P", 42)
+        self.assertIsInstance(rng, np.random.Generator)
+
+        plans = build_fk_plans("db.P", ["U_ID"], col_metas, parent_caches, {},
+                               parent_weights={"U_ID": [0.9, 0.1]})
+        plan = plans[0]
+
+        num_samples = 10000
+        picks = weighted_picks(plan, num_samples, rng)
+        heavy_rate = sum(1 for v in picks if v == 1) / num_samples
+        self.assertGreaterEqual(heavy_rate, 0.87)
+        self.assertLessEqual(heavy_rate, 0.93)
+
+        self.assertIn(weighted_pick(plan, rng), [1, 2])
+
+        # The dispatching batch resolver accepts the Generator flavor too
+        rows = resolve_fks_rows(plans, 100, rng)
+        self.assertTrue(all(row["U_ID"] in [1, 2] for row in rows))
+
+    def test_mismatched_weight_length_rejected(self):
+        """Test that weights of the wrong length raise ValueError"""
+        parent_caches = {"U_ID": [1, 2, 3]}
+        col_metas = {"U_ID": MockColumnMeta("U_ID", is_nullable="YES")}
+
+        with self.assertRaises(ValueError):
+            build_fk_plans("db.P", ["U_ID"], col_metas, parent_caches, {},
+                           parent_weights={"U_ID": [0.5, 0.5]})
+
+
+class TestFastpathDispatch(unittest.TestCase):
+    """Test the specialized batch resolver for the default config shape"""
+
+    def _plans(self, fk_population_rates):
+        parent_caches = {"U_ID": [1, 2, 3], "DEPT_ID": [100, 200]}
+        col_metas = {
+            "U_ID": MockColumnMeta("U_ID", is_nullable="YES"),
+            "DEPT_ID": MockColumnMeta("DEPT_ID", is_nullable="YES")
+        }
+        return build_fk_plans("db.P", ["U_ID", "DEPT_ID"], col_metas,
+                              parent_caches, fk_population_rates)
+
+    def test_fastpath_dispatch_used(self):
+        """Test that the fastpath is taken when all plans are 100% with parents"""
+        plans = self._plans({})
+        rng = _spawn_rng(self.id())
+
+        with patch("generate_synthetic_data_utils._resolve_fks_batch_fastpath",
+                   wraps=_resolve_fks_batch_fastpath) as fastpath:
+            rows = resolve_fks_rows(plans, 50, rng)
+            fastpath.assert_called_once_with(plans, 50, rng)
+
+        self.assertEqual(len(rows), 50)
+        for row in rows:
+            self.assertIn(row["U_ID"], [1, 2, 3])
+            self.assertIn(row["DEPT_ID"], [100, 200])
+
+    def test_fastpath_skipped_with_explicit_rate(self):
+        """Test that an explicit rate routes through the threshold-aware path"""
+        plans = self._plans({"db.P": {"U_ID": 0.5}})
+        rng = _spawn_rng(self.id())
+
+        with patch("generate_synthetic_data_utils._resolve_fks_batch_fastpath") as fastpath:
+            rows = resolve_fks_rows(plans, 1000, rng)
+            fastpath.assert_not_called()
+
+        populated = sum(1 for row in rows if "U_ID" in row)
+        self.assertGreater(populated / 1000, 0.4)
+        self.assertLess(populated / 1000, 0.6)
+        # The unrated column is still fully populated
+        self.assertTrue(all("DEPT_ID" in row for row in rows))
+
+    def test_no_plans_yields_empty_rows(self):
+        """Test that an empty plan list yields one empty dict per row"""
+        rows = resolve_fks_rows([], 5, _spawn_rng(self.id()))
+        self.assertEqual(rows, [{}] * 5)
+
+
 if __name__ == '__main__':
     unittest.main()